@@ -1,11 +1,20 @@
 # This is the app.py file.
 
 import streamlit as st
-from modules.data_processing import process_data
+from modules.data_processing import (
+    infer_column_mapping,
+    process_data,
+    rank_candidate_columns,
+)
 from modules.streamlit_logger import StreamlitMemoryHandler
 import logging
-import pydeck as pdk
-import numpy as np
+
+# Heavy dependencies (pandas, numpy, pydeck, scipy, scikit-learn) are imported
+# inside the tab or cached function that needs them, so that a new session only
+# pays for what it uses. tests/test_app.py enforces the startup budget.
+
+# Number of rows read to infer the column mapping before the full file is parsed
+SAMPLE_ROWS = 1000
 
 # Set up custom logging handler
 logger = logging.getLogger()
@@ -30,15 +39,35 @@ def hex_to_rgba(hex_color):
     return [int(hex_color[i : i + 2], 16) for i in (1, 3, 5)] + [150]
 
 
-import streamlit as st
-
-
 @st.cache_data
 def convert_df_to_csv(df):
     # IMPORTANT: Cache the conversion to prevent computation on every rerun
     return df.to_csv().encode("utf-8")
 
 
+@st.cache_data
+def compute_assignment(df, column_names, k):
+    # Cache the solver output so map setting changes don't re-solve the flow
+    from modules.assignment import assign_demand_to_supply
+
+    return assign_demand_to_supply(df, column_names, k)
+
+
+@st.cache_data
+def compute_density(df, column_names, resolution):
+    # Cache the histograms per dataset and resolution to keep reruns cheap
+    from modules.mapping import compute_density_grid
+
+    return compute_density_grid(df, column_names, resolution)
+
+
+@st.cache_data
+def infer_columns(sample_df):
+    # Cache the inference so the mapping is only computed and logged once per upload
+    ranking = rank_candidate_columns(sample_df)
+    return ranking, infer_column_mapping(sample_df, ranking)
+
+
 # Main App
 def main():
     st.title("Supply Chain Optimization App")
@@ -56,6 +85,10 @@ def main():
     if "uploaded_file_name" not in st.session_state:
         st.session_state.uploaded_file_name = None
 
+    # Initialize 'processed_key' (file id and column mapping last processed) if not already present
+    if "processed_key" not in st.session_state:
+        st.session_state.processed_key = None
+
     # Tab-like sections using st.radio
     tab = st.radio("Go to", ["Upload Dataset", "View Logs", "Visualize Data"])
 
@@ -65,18 +98,61 @@ def main():
         uploaded_file = st.file_uploader("Choose a file", type=["csv", "xlsx", "xls"])
 
         if uploaded_file:
-            import pandas as pd
+            from modules.ingestion import read_csv
 
             try:
-                df = pd.read_csv(uploaded_file)
-                (
-                    st.session_state.processed_df,
-                    st.session_state.column_names,
-                ) = process_data(df, uploaded_file.name)
-                # Store the uploaded file's name in the session state
-                st.session_state.uploaded_file_name = uploaded_file.name
+                # Read only the header and a small sample to infer the column mapping
+                sample_df = read_csv(uploaded_file, nrows=SAMPLE_ROWS)
+                uploaded_file.seek(0)
+                ranking, (inferred_columns, confident) = infer_columns(sample_df)
+
+                # Let the user confirm or correct the inferred mapping
+                st.subheader("Column Mapping")
+                selected_columns = []
+                for role, inferred_col in zip(ranking, inferred_columns):
+                    options = [col for col, _ in ranking[role]]
+                    selected_columns.append(
+                        st.selectbox(
+                            f"{role.capitalize()} column",
+                            options,
+                            index=(
+                                options.index(inferred_col)
+                                if inferred_col is not None
+                                else None
+                            ),
+                        )
+                    )
+                column_names = tuple(selected_columns)
+
+                if confident:
+                    process = True
+                else:
+                    st.warning(
+                        "Some columns could not be detected confidently. Please check the column mapping above."
+                    )
+                    process = st.button("Confirm Column Mapping")
 
-                if st.session_state.processed_df is not None:
+                # Only process again when the upload or the mapping has changed
+                processed_key = (uploaded_file.file_id, column_names)
+                is_processed = st.session_state.processed_key == processed_key
+
+                if process and None in column_names:
+                    st.error("Please select a column for every field.")
+                elif process and len(set(column_names)) < len(column_names):
+                    st.error("Please select a different column for each field.")
+                elif process and not is_processed:
+                    # Only parse the selected columns of the full file
+                    df = read_csv(uploaded_file, column_names)
+                    (
+                        st.session_state.processed_df,
+                        st.session_state.column_names,
+                    ) = process_data(df, uploaded_file.name, column_names)
+                    # Store the uploaded file's name and mapping in the session state
+                    st.session_state.uploaded_file_name = uploaded_file.name
+                    st.session_state.processed_key = processed_key
+                    is_processed = True
+
+                if is_processed and st.session_state.processed_df is not None:
                     st.write(st.session_state.processed_df.head(50))
                     # Download Button
                     st.download_button(
@@ -85,7 +161,7 @@ def main():
                         file_name=f"{st.session_state.uploaded_file_name}_cleaned.csv",
                         mime="text/csv",
                     )
-                else:
+                elif is_processed:
                     st.error(
                         "The uploaded dataset couldn't be processed correctly. Please check the logs for more details."
                     )
@@ -125,6 +201,10 @@ def main():
         st.header("Visualize Data on Map")
 
         if st.session_state.processed_df is not None:
+            import numpy as np
+            import pydeck as pdk
+            from modules.mapping import create_arc_layer, create_density_layer
+
             # Sidebar settings
             st.sidebar.header("Map Settings")
 
@@ -146,54 +226,103 @@ def main():
                 "Choose Map Style", list(map_styles.keys()), index=0
             )
 
-            # Use detect_and_validate_columns to get column names
-            lat_col, long_col, volume_col, type_col = st.session_state.column_names
+            # Supply-to-demand assignment settings
+            show_assignment = st.sidebar.checkbox("Show Supply-Demand Assignment")
+            k_nearest = st.sidebar.number_input(
+                "Candidate Supply Points per Demand Point",
+                min_value=1,
+                max_value=50,
+                value=5,
+            )
 
-            # Convert columns to appropriate types
-            lats = st.session_state.processed_df[lat_col].astype(float).tolist()
-            longs = st.session_state.processed_df[long_col].astype(float).tolist()
-            volumes = st.session_state.processed_df[volume_col].astype(float).tolist()
-            types = st.session_state.processed_df[type_col].tolist()
-
-            # Compute circle radii based on logarithm of volume
-            radii = [np.log(volume + 1) * 10000 for volume in volumes]
-            # Create data for pydeck chart
-            data = []
-            for lat, long, volume, point_type, radius in zip(
-                lats, longs, volumes, types, radii
-            ):
-                color = supply_color if point_type == "supply" else demand_color
-                data.append(
-                    {
-                        "latitude": lat,
-                        "longitude": long,
-                        "volume": volume,
-                        "type": point_type,
-                        "radius": radius,
-                        "color": color,
-                    }
+            # Visualization mode and raster resolution for density mode
+            visualization_mode = st.sidebar.radio(
+                "Visualization Mode", ["Points", "Density"], index=0
+            )
+            if visualization_mode == "Density":
+                resolution = st.sidebar.slider(
+                    "Density Resolution (bins per axis)",
+                    min_value=50,
+                    max_value=500,
+                    value=200,
+                    step=50,
                 )
 
+            # Use detect_and_validate_columns to get column names
+            lat_col, long_col, volume_col, type_col = st.session_state.column_names
+
             # Pydeck chart
             view_state = pdk.ViewState(
-                latitude=np.mean(lats), longitude=np.mean(longs), zoom=2
-            )
-            layer = pdk.Layer(
-                "ScatterplotLayer",
-                data=data,
-                get_position=["longitude", "latitude"],
-                get_radius="radius",
-                get_fill_color="color",  # RGBA
-                pickable=True,
-                auto_highlight=True,
+                latitude=st.session_state.processed_df[lat_col].astype(float).mean(),
+                longitude=st.session_state.processed_df[long_col].astype(float).mean(),
+                zoom=2,
             )
+
+            if visualization_mode == "Density":
+                grids = compute_density(
+                    st.session_state.processed_df,
+                    st.session_state.column_names,
+                    resolution,
+                )
+                layers = [
+                    create_density_layer(grids["supply"], supply_color),
+                    create_density_layer(grids["demand"], demand_color),
+                ]
+            else:
+                # Convert columns to appropriate types
+                lats = st.session_state.processed_df[lat_col].astype(float).tolist()
+                longs = st.session_state.processed_df[long_col].astype(float).tolist()
+                volumes = (
+                    st.session_state.processed_df[volume_col].astype(float).tolist()
+                )
+                types = st.session_state.processed_df[type_col].tolist()
+
+                # Compute circle radii based on logarithm of volume
+                radii = [np.log(volume + 1) * 10000 for volume in volumes]
+                # Create data for pydeck chart
+                data = []
+                for lat, long, volume, point_type, radius in zip(
+                    lats, longs, volumes, types, radii
+                ):
+                    color = supply_color if point_type == "supply" else demand_color
+                    data.append(
+                        {
+                            "latitude": lat,
+                            "longitude": long,
+                            "volume": volume,
+                            "type": point_type,
+                            "radius": radius,
+                            "color": color,
+                        }
+                    )
+
+                layer = pdk.Layer(
+                    "ScatterplotLayer",
+                    data=data,
+                    get_position=["longitude", "latitude"],
+                    get_radius="radius",
+                    get_fill_color="color",  # RGBA
+                    pickable=True,
+                    auto_highlight=True,
+                )
+                layers = [layer]
+
+            if show_assignment:
+                # Solving can take several seconds on tens of thousands of points
+                with st.spinner("Solving supply-demand assignment..."):
+                    flows = compute_assignment(
+                        st.session_state.processed_df,
+                        st.session_state.column_names,
+                        k_nearest,
+                    )
+                layers.append(create_arc_layer(flows, supply_color, demand_color))
             tooltip = {
                 "text": "Type: {type}, Latitude: {latitude}, Longitude: {longitude}, Volume: {volume}"
             }
             st.pydeck_chart(
                 pdk.Deck(
                     map_style=map_styles[map_style],
-                    layers=[layer],
+                    layers=layers,
                     initial_view_state=view_state,
                     tooltip=tooltip,
                 )
@@ -1,3 +1,5 @@
+from difflib import SequenceMatcher
+
 from modules.logger import get_logger
 
 logger = get_logger()
@@ -85,18 +87,131 @@ def clean_dataframe(df, invalid_indices):
     return df
 
 
-def detect_and_validate_columns(df):
-    # Define valid column names
-    valid_lat_names = ["lat", "Lat", "Latitude", "latitude"]
-    valid_lon_names = ["lon", "Lon", "long", "Long", "Longitude", "longitude"]
-    valid_vol_names = ["volume", "Volume", "vol", "Vol"]
-    valid_type_names = ["type", "Type"]
+# Valid column names and value check for each necessary column, in the
+# (lat, lon, volume, type) order used throughout the app
+COLUMN_ROLES = {
+    "latitude": (["lat", "Lat", "Latitude", "latitude"], is_valid_latitude),
+    "longitude": (
+        ["lon", "Lon", "long", "Long", "Longitude", "longitude"],
+        is_valid_longitude,
+    ),
+    "volume": (["volume", "Volume", "vol", "Vol"], is_valid_volume),
+    "type": (["type", "Type"], is_valid_type),
+}
+
+# Minimum candidate score for an inferred column mapping to be used without confirmation
+CONFIDENT_SCORE = 0.8
+
+
+def header_similarity(column_name, valid_names):
+    """Score how closely a header matches a list of valid names (0 to 1)."""
+    name = str(column_name).strip().lower()
+    scores = []
+    for valid_name in valid_names:
+        valid_name = valid_name.lower()
+        if name == valid_name:
+            return 1.0
+        # Headers such as 'store_latitude' contain a valid name
+        if len(valid_name) > 3 and valid_name in name:
+            scores.append(0.9)
+        scores.append(SequenceMatcher(None, name, valid_name).ratio())
+    return max(scores)
+
+
+def value_match_ratio(values, validation_function):
+    """Return the share of non-missing sample values passing a validation function."""
+    values = [value for value in values if not is_permissible_missing(value)]
+    if not values:
+        return 0.0
+    return sum(validation_function(value) for value in values) / len(values)
+
+
+def rank_candidate_columns(sample_df):
+    """Rank the columns of a sample dataframe for each necessary column.
+
+    Each candidate is scored on the average of its header similarity to the
+    valid names and the share of its sample values that pass validation.
+
+    Returns:
+    - ranking: Dict mapping each role in COLUMN_ROLES to a list of
+      (column, score) tuples, best candidate first.
+    """
+    ranking = {}
+    for role, (valid_names, validation_function) in COLUMN_ROLES.items():
+        candidates = [
+            (
+                col,
+                (
+                    header_similarity(col, valid_names)
+                    + value_match_ratio(sample_df[col].tolist(), validation_function)
+                )
+                / 2,
+            )
+            for col in sample_df.columns
+        ]
+        ranking[role] = sorted(candidates, key=lambda candidate: -candidate[1])
+    return ranking
+
+
+def infer_column_mapping(sample_df, ranking=None):
+    """Infer the (lat, lon, volume, type) columns from a sample of the dataset.
+
+    Columns are assigned greedily from the highest scoring candidates so that
+    each column is used for a single role. A ranking already computed with
+    rank_candidate_columns can be passed to avoid scoring the sample again.
+
+    Returns:
+    - column_names: Tuple of inferred column names, None where no column fits.
+    - confident: Whether every column was found with a score of at least
+      CONFIDENT_SCORE, i.e. the mapping can be used without confirmation.
+    """
+    if ranking is None:
+        ranking = rank_candidate_columns(sample_df)
+    candidates = sorted(
+        (
+            (score, role, col)
+            for role, role_candidates in ranking.items()
+            for col, score in role_candidates
+            if score > 0
+        ),
+        key=lambda candidate: -candidate[0],
+    )
+
+    mapping, scores = {}, {}
+    for score, role, col in candidates:
+        if role not in mapping and col not in mapping.values():
+            mapping[role] = col
+            scores[role] = score
+
+    column_names = tuple(mapping.get(role) for role in COLUMN_ROLES)
+    confident = all(scores.get(role, 0) >= CONFIDENT_SCORE for role in COLUMN_ROLES)
+    for role, col in zip(COLUMN_ROLES, column_names):
+        logger.info(
+            f"Inferred '{col}' as {role} column (score {scores.get(role, 0):.2f})."
+        )
+    return column_names, confident
+
 
-    # Detect columns based on valid names
-    lat_col = next((col for col in df.columns if col in valid_lat_names), None)
-    long_col = next((col for col in df.columns if col in valid_lon_names), None)
-    volume_col = next((col for col in df.columns if col in valid_vol_names), None)
-    type_col = next((col for col in df.columns if col in valid_type_names), None)
+def detect_and_validate_columns(df, column_names=None):
+    """Detect the necessary columns, log invalid entries and clean the dataframe.
+
+    If column_names is given, it is used as the (lat, lon, volume, type) mapping
+    instead of detecting columns from their header names.
+    """
+    if column_names is not None:
+        lat_col, long_col, volume_col, type_col = (
+            col if col in df.columns else None for col in column_names
+        )
+    else:
+        # Detect columns based on valid names
+        lat_col, long_col, volume_col, type_col = (
+            next((col for col in df.columns if col in valid_names), None)
+            for valid_names, _ in COLUMN_ROLES.values()
+        )
+
+    # Stop before validating if a column could not be found
+    if not all([lat_col, long_col, volume_col, type_col]):
+        return lat_col, long_col, volume_col, type_col
 
     # Log invalid entries for detected columns
     invalid_lat_indices = log_invalid_entries(
@@ -142,7 +257,7 @@ def detect_and_validate_columns(df):
     return lat_col, long_col, volume_col, type_col
 
 
-def process_data(df, filename):
+def process_data(df, filename, column_names=None):
     # Log the dataset being processed
     logger.info("===========================================")
     logger.info(f"Processing {filename}...")
@@ -151,14 +266,16 @@ def process_data(df, filename):
     df = df.copy(deep=True)
 
     # Detect and validate columns
-    lat_col, long_col, volume_col, type_col = detect_and_validate_columns(df)
+    lat_col, long_col, volume_col, type_col = detect_and_validate_columns(
+        df, column_names
+    )
 
     # Ensure necessary columns were detected and validated
     if not all([lat_col, long_col, volume_col, type_col]):
         logger.error(
             "Failed to detect or validate all necessary columns. Processing halted."
         )
-        return None
+        return None, None
 
     return df[[lat_col, long_col, volume_col, type_col]], (
         lat_col,
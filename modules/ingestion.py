@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from modules.logger import get_logger
+
+logger = get_logger()
+
+# Files at least this large are parsed with the multi-threaded Arrow reader
+ARROW_MIN_BYTES = 5 * 1024 * 1024
+
+# Values read as missing by the Arrow reader, the same as the documented pandas
+# read_csv defaults so that both engines return the same dataframe
+ARROW_NULL_VALUES = (
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+)
+
+
+def get_file_size(file):
+    """Return the size in bytes of an uploaded file, file object or path."""
+    if isinstance(file, (str, os.PathLike)):
+        return os.path.getsize(file)
+    if hasattr(file, "size"):
+        return file.size
+    position = file.tell()
+    size = file.seek(0, os.SEEK_END)
+    file.seek(position)
+    return size
+
+
+def read_csv_pandas(file, column_names=None, nrows=None):
+    """Read a CSV file with the single-threaded pandas C parser."""
+    usecols = list(column_names) if column_names is not None else None
+    return pd.read_csv(file, usecols=usecols, nrows=nrows)
+
+
+def read_csv_arrow(file, column_names=None):
+    """Read a CSV file with the multi-threaded Arrow reader.
+
+    When column_names is given as (lat, lon, volume, type), only those columns
+    are parsed and the type column is read as strings. Numeric column types are
+    inferred like the pandas parser does, so both engines return the same
+    dtypes. Values that don't fit the inferred types make Arrow raise, so they
+    can be handled by the pandas parser.
+    """
+    from pyarrow import csv
+
+    convert_options = csv.ConvertOptions(
+        null_values=list(ARROW_NULL_VALUES), strings_can_be_null=True
+    )
+    if column_names is not None:
+        type_col = column_names[3]
+        convert_options.include_columns = list(column_names)
+        convert_options.column_types = {type_col: "string"}
+
+    table = csv.read_csv(
+        file,
+        read_options=csv.ReadOptions(use_threads=True),
+        convert_options=convert_options,
+    )
+    df = table.to_pandas()
+
+    # Missing strings come back as None; use NaN like the pandas parser
+    string_cols = df.select_dtypes(exclude="number").columns
+    df[string_cols] = df[string_cols].where(df[string_cols].notna(), np.nan)
+    return df
+
+
+def read_csv(file, column_names=None, nrows=None, engine="auto"):
+    """
+    Read a CSV dataset with the most suitable parsing engine.
+
+    Parameters:
+    - file: Uploaded file, file object or path of the CSV file.
+    - column_names: Optional tuple of (lat_col, long_col, volume_col, type_col)
+      restricting the columns to parse.
+    - nrows: Optional number of rows to read, always handled by pandas.
+    - engine: 'arrow', 'pandas' or 'auto' to use Arrow for files of at least
+      ARROW_MIN_BYTES. Arrow falls back to pandas if it is not installed or
+      can't parse the file.
+
+    Returns:
+    - df: The parsed dataframe.
+    """
+    if engine == "auto":
+        engine = "arrow" if get_file_size(file) >= ARROW_MIN_BYTES else "pandas"
+
+    if engine == "arrow" and nrows is None:
+        try:
+            df = read_csv_arrow(file, column_names)
+            logger.info(f"Parsed {len(df)} rows with the Arrow CSV reader.")
+            return df
+        except ImportError:
+            logger.warning("pyarrow is not installed. Falling back to pandas.")
+        except Exception as e:
+            logger.warning(
+                f"Arrow CSV reader failed ({e}). Falling back to the pandas parser."
+            )
+        if not isinstance(file, (str, os.PathLike)):
+            file.seek(0)
+
+    return read_csv_pandas(file, column_names, nrows)
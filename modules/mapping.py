@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+
+
+def compute_density_grid(df, column_names, resolution=200):
+    """Compute volume-weighted 2D histograms of supply and demand points.
+
+    Both histograms share the same bin edges, spanning the extent of the whole
+    dataset, so the number of returned bins depends on the resolution only.
+
+    Parameters:
+    - df: Processed dataframe, as returned by process_data.
+    - column_names: Tuple of (lat_col, long_col, volume_col, type_col).
+    - resolution: Number of bins along each axis.
+
+    Returns:
+    - grids: Dict mapping 'supply' and 'demand' to dataframes of non-empty
+      bin centres with 'latitude', 'longitude' and 'weight' columns.
+    """
+    lat_col, long_col, volume_col, type_col = column_names
+    lats = df[lat_col].to_numpy(dtype=float)
+    longs = df[long_col].to_numpy(dtype=float)
+    volumes = df[volume_col].to_numpy(dtype=float)
+    types = df[type_col].astype(str).str.strip().str.lower().to_numpy()
+
+    empty = pd.DataFrame(columns=["latitude", "longitude", "weight"], dtype=float)
+    if len(lats) == 0:
+        return {"supply": empty, "demand": empty}
+
+    lat_edges = np.linspace(lats.min(), lats.max(), resolution + 1)
+    long_edges = np.linspace(longs.min(), longs.max(), resolution + 1)
+    lat_centres = (lat_edges[:-1] + lat_edges[1:]) / 2
+    long_centres = (long_edges[:-1] + long_edges[1:]) / 2
+
+    grids = {}
+    for point_type in ["supply", "demand"]:
+        mask = types == point_type
+        weights, _, _ = np.histogram2d(
+            lats[mask],
+            longs[mask],
+            bins=[lat_edges, long_edges],
+            weights=volumes[mask],
+        )
+        lat_ids, long_ids = np.nonzero(weights)
+        grids[point_type] = pd.DataFrame(
+            {
+                "latitude": lat_centres[lat_ids],
+                "longitude": long_centres[long_ids],
+                "weight": weights[lat_ids, long_ids],
+            }
+        )
+    return grids
+
+
+def create_density_layer(grid, color):
+    """Create a pydeck HeatmapLayer from a density grid, shaded in a single color."""
+    # Fade from transparent to the chosen color as density increases
+    color_range = [color[:3] + [alpha] for alpha in (25, 75, 125, 175, 215, 255)]
+    return pdk.Layer(
+        "HeatmapLayer",
+        data=grid,
+        get_position=["longitude", "latitude"],
+        get_weight="weight",
+        color_range=color_range,
+        aggregation="SUM",
+        pickable=False,
+    )
+
+
+def create_arc_layer(flows, source_color, target_color):
+    """Create a pydeck ArcLayer drawing supply-to-demand flows.
+
+    Arc widths are scaled on the logarithm of the flow, like the scatter radii.
+    """
+    data = flows.assign(width=np.log(flows["flow"] + 1))
+    return pdk.Layer(
+        "ArcLayer",
+        data=data,
+        get_source_position=["supply_longitude", "supply_latitude"],
+        get_target_position=["demand_longitude", "demand_latitude"],
+        get_source_color=source_color,
+        get_target_color=target_color,
+        get_width="width",
+        pickable=True,
+        auto_highlight=True,
+    )
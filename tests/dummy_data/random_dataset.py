@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+
+
+def random_dataset(n, supply_share=0.5, seed=0):
+    """Create a reproducible random dataset of supply and demand points."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "lat": rng.uniform(-60, 60, n),
+            "lon": rng.uniform(-180, 180, n),
+            "Volume": rng.uniform(1, 100, n),
+            "Type": rng.choice(
+                ["supply", "demand"], n, p=[supply_share, 1 - supply_share]
+            ),
+        }
+    )
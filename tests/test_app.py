@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Maximum time, in seconds, that importing app.py may take in a fresh interpreter
+IMPORT_TIME_BUDGET = float(os.environ.get("IMPORT_TIME_BUDGET", "1.0"))
+
+# Modules that must only be loaded when the tab that needs them is used
+HEAVY_MODULES = ["pandas", "numpy", "pydeck", "scipy", "sklearn", "sqlalchemy", "folium"]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SCRIPT = f"""
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(json.dumps([elapsed, loaded]))
+"""
+
+
+def measure_app_import():
+    """Import app.py in a fresh interpreter and return its import time and heavy modules loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=REPO_ROOT,
+        env={**os.environ, "LOG": "false"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return elapsed, loaded
+
+
+def test_app_import_is_lazy():
+    pytest.importorskip("streamlit")
+    _, loaded = measure_app_import()
+    assert not loaded, f"Heavy modules loaded at startup: {loaded}"
+
+
+def test_app_import_time_budget():
+    pytest.importorskip("streamlit")
+    # Keep the best of a few runs to reduce noise from the machine load
+    elapsed = min(measure_app_import()[0] for _ in range(3))
+    print(f"app.py import time: {elapsed:.3f}s (budget {IMPORT_TIME_BUDGET:.3f}s)")
+    assert (
+        elapsed < IMPORT_TIME_BUDGET
+    ), f"Importing app.py took {elapsed:.3f}s, over the {IMPORT_TIME_BUDGET:.3f}s budget."
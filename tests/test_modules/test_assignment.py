@@ -0,0 +1,83 @@
+import os
+
+# needs to be before the assignment import otherwise it will create a log file
+os.environ["LOG"] = "false"
+
+import numpy as np
+import pandas as pd
+from modules.assignment import assign_demand_to_supply
+from tests.dummy_data.random_dataset import random_dataset
+
+COLUMN_NAMES = ("lat", "lon", "Volume", "Type")
+
+BALANCED_DATASET = {
+    "lat": [0.0, 0.0, 0.0, 0.0],
+    "lon": [0.0, 10.0, 1.0, 9.0],
+    "Volume": [100, 100, 100, 100],
+    "Type": ["supply", "SUPPLY", "demand", "demand"],
+}
+
+CAPACITY_DATASET = {
+    "lat": [0.0, 0.0, 0.0, 0.0],
+    "lon": [0.0, 10.0, 1.0, 2.0],
+    "Volume": [150, 100, 100, 100],
+    "Type": ["supply", "supply", "demand", "demand"],
+}
+
+SHORTAGE_DATASET = {
+    "lat": [0.0, 0.0, 0.0],
+    "lon": [0.0, 1.0, 2.0],
+    "Volume": [100, 80, 80],
+    "Type": ["supply", "demand", "demand"],
+}
+
+NO_SUPPLY_DATASET = {
+    "lat": [0.0, 0.0],
+    "lon": [1.0, 2.0],
+    "Volume": [80, 80],
+    "Type": ["demand", "demand"],
+}
+
+
+def test_nearest_supply_assignment():
+    df = pd.DataFrame(BALANCED_DATASET)
+    flows = assign_demand_to_supply(df, COLUMN_NAMES)
+    pairs = set(zip(flows["supply_index"], flows["demand_index"]))
+    assert pairs == {(0, 2), (1, 3)}, "Demand should be served by its nearest supply."
+    assert np.allclose(flows["flow"], 100)
+
+
+def test_supply_capacity_is_respected():
+    df = pd.DataFrame(CAPACITY_DATASET)
+    flows = assign_demand_to_supply(df, COLUMN_NAMES)
+    shipped = flows.groupby("supply_index")["flow"].sum()
+    assert np.isclose(shipped[0], 150), "Nearest supply should ship its full capacity."
+    assert np.isclose(shipped[1], 50), "Remaining demand should use the far supply."
+    assert np.isclose(flows["flow"].sum(), 200)
+
+
+def test_unmet_demand_when_supply_is_short():
+    df = pd.DataFrame(SHORTAGE_DATASET)
+    flows = assign_demand_to_supply(df, COLUMN_NAMES)
+    assert np.isclose(flows["flow"].sum(), 100), "Only the supply capacity is shipped."
+    served = flows.groupby("demand_index")["flow"].sum()
+    assert np.isclose(served[1], 80), "The closest demand should be served first."
+
+
+def test_k_limits_candidate_edges():
+    df = pd.DataFrame(CAPACITY_DATASET)
+    flows = assign_demand_to_supply(df, COLUMN_NAMES, k=1)
+    assert set(flows["supply_index"]) == {0}, "Only the nearest supply is a candidate."
+    assert np.isclose(flows["flow"].sum(), 150)
+
+
+def test_no_supply_returns_empty_flows():
+    df = pd.DataFrame(NO_SUPPLY_DATASET)
+    flows = assign_demand_to_supply(df, COLUMN_NAMES)
+    assert flows.empty
+
+
+def test_flows_are_positive():
+    df = random_dataset(500, supply_share=0.2)
+    flows = assign_demand_to_supply(df, COLUMN_NAMES)
+    assert (flows["flow"] > 1e-9).all(), "Round-off flows should not be drawn."
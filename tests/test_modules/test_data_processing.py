@@ -4,7 +4,11 @@ import os
 os.environ["LOG"] = "false"
 
 import pandas as pd
-from modules.data_processing import process_data
+from modules.data_processing import (
+    infer_column_mapping,
+    process_data,
+    rank_candidate_columns,
+)
 
 # Additional sample datasets for testing
 
@@ -138,10 +142,11 @@ def test_invalid_volume_dataset():
 def test_missing_columns_dataset():
     print("Testing dataset missing mandatory columns...")
     df = pd.DataFrame(MISSING_COLUMNS_DATASET)
-    processed_df = process_data(df)
+    processed_df, column_names = process_data(df, "missing.csv")
     assert (
         processed_df is None
     ), "Dataset missing mandatory columns should not be processed."
+    assert column_names is None
     print("Missing columns dataset passed.")
 
 
@@ -166,3 +171,60 @@ def test_mixed_missing_values_dataset():
         processed_df is None
     ), "Dataset with mixed missing values should not be processed."
     print("Mixed missing values dataset passed.")
+
+
+# Sample datasets for column mapping inference
+RENAMED_COLUMNS_DATASET = {
+    "site_name": ["a", "b", "c"],
+    "store_latitude": [10.0, 20.0, 30.0],
+    "store_longitude": [-150.0, 40.0, 160.0],
+    "Volume": [100, 200, 300],
+    "Type": ["supply", "demand", "SUPPLY"],
+}
+
+AMBIGUOUS_COLUMNS_DATASET = {
+    "y": [10.0, 20.0, 30.0],
+    "x": [-150.0, 40.0, 160.0],
+    "qty": [100, 200, 300],
+    "kind": ["supply", "demand", "SUPPLY"],
+}
+
+
+def test_infer_column_mapping_exact_names():
+    df = pd.DataFrame(VALID_DATASET)
+    column_names, confident = infer_column_mapping(df)
+    assert column_names == ("Lat", "lon", "Volume", "Type")
+    assert confident, "Exact column names should be inferred confidently."
+
+
+def test_infer_column_mapping_similar_names():
+    df = pd.DataFrame(RENAMED_COLUMNS_DATASET)
+    column_names, confident = infer_column_mapping(df)
+    assert column_names == ("store_latitude", "store_longitude", "Volume", "Type")
+    assert confident, "Headers containing valid names should be inferred confidently."
+
+
+def test_infer_column_mapping_ambiguous_names():
+    df = pd.DataFrame(AMBIGUOUS_COLUMNS_DATASET)
+    column_names, confident = infer_column_mapping(df)
+    assert column_names[3] == "kind", "Type column should be found from its values."
+    assert not confident, "Unknown headers should require confirmation."
+
+
+def test_rank_candidate_columns():
+    df = pd.DataFrame(RENAMED_COLUMNS_DATASET)
+    ranking = rank_candidate_columns(df)
+    assert ranking["type"][0][0] == "Type"
+    # Values outside the latitude range lower the longitude column's latitude score
+    lat_scores = dict(ranking["latitude"])
+    assert lat_scores["store_latitude"] > lat_scores["store_longitude"]
+
+
+def test_process_data_with_column_names():
+    df = pd.DataFrame(AMBIGUOUS_COLUMNS_DATASET)
+    processed_df, column_names = process_data(
+        df, "ambiguous.csv", ("y", "x", "qty", "kind")
+    )
+    assert column_names == ("y", "x", "qty", "kind")
+    assert len(processed_df) == len(df)
+
@@ -0,0 +1,69 @@
+import os
+
+# needs to be before the ingestion import otherwise it will create a log file
+os.environ["LOG"] = "false"
+
+import io
+
+import pandas as pd
+from modules.ingestion import read_csv, read_csv_arrow
+
+COLUMN_NAMES = ("lat", "lon", "Volume", "Type")
+
+VALID_CSV = b"""site,lat,lon,Volume,Type
+a,10.0,-50.0,100,supply
+b,20.0,40.0,200,demand
+c,30.0,60.0,300,SUPPLY
+"""
+
+MISSING_VALUES_CSV = b"""lat,lon,Volume,Type
+10.0,-50.0,100,supply
+N/A,40.0,200,na
+30.0,,300,
+"""
+
+NULL_TOKENS_CSV = b"""lat,lon,Volume,Type
+10.0,-50.0,100,supply
+None,40.0,200,NULL
+30.0,<NA>,300,None
+40.0,50.0,,N/A
+"""
+
+INVALID_VOLUME_CSV = b"""lat,lon,Volume,Type
+10.0,-50.0,100,supply
+20.0,40.0,INVALID,demand
+"""
+
+
+def test_arrow_and_pandas_engines_match():
+    arrow_df = read_csv(io.BytesIO(VALID_CSV), COLUMN_NAMES, engine="arrow")
+    pandas_df = read_csv(io.BytesIO(VALID_CSV), COLUMN_NAMES, engine="pandas")
+    assert list(arrow_df.columns) == list(COLUMN_NAMES)
+    pd.testing.assert_frame_equal(arrow_df, pandas_df)
+
+
+def test_arrow_engine_reads_pandas_null_tokens():
+    # Read with Arrow directly to make sure it doesn't fall back to pandas
+    arrow_df = read_csv_arrow(io.BytesIO(NULL_TOKENS_CSV), COLUMN_NAMES)
+    pandas_df = read_csv(io.BytesIO(NULL_TOKENS_CSV), COLUMN_NAMES, engine="pandas")
+    pd.testing.assert_frame_equal(arrow_df, pandas_df)
+    assert arrow_df["Type"].isna().sum() == 3
+
+
+def test_arrow_engine_keeps_missing_values():
+    arrow_df = read_csv_arrow(io.BytesIO(MISSING_VALUES_CSV), COLUMN_NAMES)
+    pandas_df = read_csv(io.BytesIO(MISSING_VALUES_CSV), COLUMN_NAMES, engine="pandas")
+    pd.testing.assert_frame_equal(arrow_df, pandas_df)
+    # 'na' is not a pandas missing token, it is left to process_data
+    assert arrow_df["Type"].tolist()[1] == "na"
+
+
+def test_arrow_engine_falls_back_to_pandas():
+    df = read_csv(io.BytesIO(INVALID_VOLUME_CSV), COLUMN_NAMES, engine="arrow")
+    assert df["Volume"].tolist() == ["100", "INVALID"], "Invalid values should be kept."
+
+
+def test_nrows_reads_sample():
+    df = read_csv(io.BytesIO(VALID_CSV), nrows=2, engine="arrow")
+    assert len(df) == 2
+    assert "site" in df.columns
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from modules.mapping import compute_density_grid, create_density_layer
+from tests.dummy_data.random_dataset import random_dataset
+
+COLUMN_NAMES = ("lat", "lon", "Volume", "Type")
+
+DENSITY_DATASET = {
+    "lat": [0.0, 0.1, 10.0, 10.0],
+    "lon": [0.0, 0.1, 10.0, 0.0],
+    "Volume": [100, 50, 200, 300],
+    "Type": ["supply", "SUPPLY", "demand", "demand"],
+}
+
+
+def test_density_grid_preserves_volume():
+    df = pd.DataFrame(DENSITY_DATASET)
+    grids = compute_density_grid(df, COLUMN_NAMES, resolution=10)
+    assert np.isclose(grids["supply"]["weight"].sum(), 150)
+    assert np.isclose(grids["demand"]["weight"].sum(), 500)
+    # Both nearby supply points fall into the same bin
+    assert len(grids["supply"]) == 1
+    assert len(grids["demand"]) == 2
+
+
+def test_density_grid_size_depends_on_resolution_only():
+    df = random_dataset(100000)
+    grids = compute_density_grid(df, COLUMN_NAMES, resolution=20)
+    assert len(grids["supply"]) <= 20 * 20
+    assert len(grids["demand"]) <= 20 * 20
+
+
+def test_density_layer():
+    df = pd.DataFrame(DENSITY_DATASET)
+    grids = compute_density_grid(df, COLUMN_NAMES, resolution=10)
+    layer = create_density_layer(grids["supply"], [255, 0, 0, 150])
+    assert layer.type == "HeatmapLayer"